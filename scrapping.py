@@ -1,136 +1,464 @@
 import os
 import re
-import json
-import time
+import hashlib
+import shutil
+import socket
+import tempfile
+import threading
+from itertools import count
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from diskcache import Cache
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # Base URL and main page for the Chamber Finder.
 BASE_URL = "https://www.uschamber.com"
 MAIN_PAGE = f"{BASE_URL}/co/chambers"
+BASE_HOST = urlsplit(BASE_URL).netloc
 
-def sanitize_filename(name):
+# One CSS selector per field, shared by the static and browser extractors.
+CHAMBER_SELECTOR = ".chamber-finder__content"
+NAME_SELECTOR = "h3"
+ADDRESS_SELECTOR = ".chamber-finder__address"
+
+# Shared HTTP session so the static fetches reuse pooled connections.
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+# Extracted chambers per state URL, reused by later runs for a day. Bump
+# EXTRACTOR_VERSION whenever extraction changes so stale results are ignored.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+CACHE_TTL = 24 * 60 * 60
+EXTRACTOR_VERSION = 3
+
+# Number of states scraped concurrently.
+MAX_WORKERS = 4
+
+# Chrome is only started if a page can't be scraped from its static HTML.
+# WebDriver is not thread-safe, so each worker thread gets its own driver.
+_local = threading.local()
+_drivers = []
+_drivers_lock = threading.Lock()
+
+# Chrome subsystems the scraper has no use for.
+CHROME_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-translate",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-features=TranslateUI,BlinkGenPropertyTrees",
+]
+
+# Listings are plain text, so the browser skips fetching these.
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.woff", "*.woff2", "*.css", "*.svg", "*.ico"]
+
+# A single chromedriver process serves every worker's session. The Chrome
+# binary found alongside it (e.g. Chrome for Testing) is used by every session.
+_service = None
+_browser_path = None
+
+# Each worker keeps a stable profile (Chrome locks a profile to one process),
+# so its HTTP/DNS caches carry over between the states it visits. Profiles
+# live next to the result cache, not in the shared temp dir.
+PROFILE_ROOT = os.path.join(SCRIPT_DIR, ".chrome-profiles")
+DISK_CACHE_SIZE = 100 * 1024 * 1024
+_profile_ids = count()
+_temp_profiles = []
+
+def make_options(profile_dir=None):
+    
+    chrome_options = Options()
+    if _browser_path:
+        chrome_options.binary_location = _browser_path
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    for arg in CHROME_ARGS:
+        chrome_options.add_argument(arg)
+    if profile_dir is not None:
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        chrome_options.add_argument(f"--disk-cache-size={DISK_CACHE_SIZE}")
+    # Return from driver.get on DOMContentLoaded; wait_for_stable covers the rest.
+    chrome_options.page_load_strategy = "eager"
+    return chrome_options
+
+def get_service():
+    
+    global _service, _browser_path
+    with _drivers_lock:
+        if _service is None:
+            # Same lookup as ChromiumDriver.__init__, which Remote skips.
+            service = Service()
+            finder = DriverFinder(service, make_options())
+            _browser_path = finder.get_browser_path() or None
+            service.path = service.env_path() or finder.get_driver_path()
+            service.start()
+            _service = service
+    return _service
+
+def clear_stale_lock(profile_dir):
+    
+    # Chrome's SingletonLock links to "<hostname>-<pid>"; drop it if that
+    # Chrome crashed and left it behind.
+    try:
+        host, _, pid = os.readlink(os.path.join(profile_dir, "SingletonLock")).rpartition("-")
+        if host != socket.gethostname():
+            return
+        os.kill(int(pid), 0)
+        return
+    except ProcessLookupError:
+        pass
+    except (OSError, ValueError):
+        return
+    for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+        try:
+            os.unlink(os.path.join(profile_dir, name))
+        except FileNotFoundError:
+            pass
+
+def start_session(service, profile_dir):
     
-    name = name.strip()
-    if "\n" in name:
-        name = name.split("\n")[0]
-    return re.sub(r'[\\/*?:"<>|]', "_", name)
+    # Keep-alive connections to chromedriver with a pool large enough that
+    # concurrent commands don't hit "connection pool is full". Selenium reads
+    # the urllib3 arguments from a nested "init_args_for_pool_manager" key.
+    client_config = ClientConfig(
+        remote_server_addr=service.service_url,
+        keep_alive=True,
+        init_args_for_pool_manager={"init_args_for_pool_manager": {"maxsize": 32, "block": False}},
+    )
+    return webdriver.Remote(
+        command_executor=service.service_url,
+        options=make_options(profile_dir),
+        client_config=client_config,
+    )
+
+def make_driver():
+    
+    service = get_service()
+    os.makedirs(PROFILE_ROOT, mode=0o700, exist_ok=True)
+    profile_dir = os.path.join(PROFILE_ROOT, f"worker-{next(_profile_ids)}")
+    clear_stale_lock(profile_dir)
+    try:
+        driver = start_session(service, profile_dir)
+    except WebDriverException as e:
+        # Usually another run is using this profile; fall back to a throwaway one.
+        print(f"Could not use profile {profile_dir}, using a temporary one: {e.msg}")
+        profile_dir = tempfile.mkdtemp(prefix="tmp-", dir=PROFILE_ROOT)
+        with _drivers_lock:
+            _temp_profiles.append(profile_dir)
+        driver = start_session(service, profile_dir)
+    # Remote has no execute_cdp_cmd, but its Chrome connection knows the command.
+    driver.execute("executeCdpCommand", {"cmd": "Network.enable", "params": {}})
+    driver.execute("executeCdpCommand", {"cmd": "Network.setBlockedURLs", "params": {"urls": BLOCKED_URLS}})
+    return driver
+
+def get_driver():
+    
+    driver = getattr(_local, "driver", None)
+    if driver is None:
+        driver = make_driver()
+        _local.driver = driver
+        with _drivers_lock:
+            _drivers.append(driver)
+    return driver
+
+def release_driver():
+    
+    driver = getattr(_local, "driver", None)
+    if driver is not None:
+        _local.driver = None
+        with _drivers_lock:
+            _drivers.remove(driver)
+        driver.quit()
+
+def probe_static(url, selector=CHAMBER_SELECTOR):
+    
+    try:
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Static fetch failed for {url}: {e}")
+        return None
+    tree = LexborHTMLParser(response.text)
+    if tree.css_first(selector) is None:
+        return None
+    return tree
+
+# True once the number of matches is non-zero and unchanged since the last poll.
+# The settled matches are kept in window.__cfc so extraction can reuse them
+# instead of running the selector again.
+STABLE_COUNT_JS = """
+var nodes = document.querySelectorAll(arguments[0]);
+var n = nodes.length;
+if (window.__lastN === n && n > 0) {
+    (window.__cfc = window.__cfc || {})[arguments[0]] = nodes;
+    return true;
+}
+window.__lastN = n;
+return false;
+"""
+
+def wait_for_stable(driver, selector, timeout=10):
+    
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: d.execute_script(STABLE_COUNT_JS, selector)
+    )
+
+def get_state_links_static(tree):
+    
+    state_links = {}
+    for link in tree.css("#chamber-finder-js a"):
+        href = link.attributes.get("href")
+        state_name = inner_text(link)
+        if href:
+            # Resolve the same way the browser's a.href does.
+            href = urljoin(MAIN_PAGE, href)
+        if href and state_name and ("/co/chambers/" in href) and (href != MAIN_PAGE):
+            state_links[state_name] = href
+    return state_links
+
+# Runs in the browser; arguments[0] is MAIN_PAGE. Returns [href, name] pairs,
+# or null when the container is missing.
+STATE_LINKS_JS = """
+const container = document.getElementById('chamber-finder-js');
+if (!container) { return null; }
+return [...container.querySelectorAll('a')]
+    .filter(a => a.href.includes('/co/chambers/') && a.href !== arguments[0])
+    .map(a => [a.href, a.innerText.trim()])
+    .filter(row => row[1]);
+"""
 
 def get_state_links(driver):
     
     state_links = {}
     try:
-        container = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "chamber-finder-js"))
-        )
-        links = container.find_elements(By.TAG_NAME, "a")
-        for link in links:
-            href = link.get_attribute("href")
-            state_name = link.text.strip()
-            if href and state_name and ("/co/chambers/" in href) and (href != MAIN_PAGE):
-                state_links[state_name] = href
+        # One round-trip for all links instead of two per link.
+        rows = driver.execute_script(STATE_LINKS_JS, MAIN_PAGE)
+        if rows is None:
+            print("State links container not found on", MAIN_PAGE)
+            return state_links
+        for href, state_name in rows:
+            state_links[state_name] = href
     except Exception as e:
         print("Error while trying to get state links:", e)
     return state_links
 
-def scrape_state(driver, state_name, state_url):
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Tags that start a new line in rendered text, like innerText does.
+BLOCK_TAGS = {
+    "address", "article", "div", "footer", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "li", "ol", "p", "section", "table", "tr", "ul",
+}
+
+# Marks a <br> or block boundary in the collected text; never part of the source.
+LINE_BREAK = None
+
+def _collect_text(node, parts):
+    
+    for child in node.iter(include_text=True):
+        if child.is_text_node:
+            # Source newlines are just formatting, so collapse them like spaces.
+            parts.append(_WHITESPACE_RE.sub(" ", child.text_content or ""))
+        elif child.tag == "br":
+            parts.append(LINE_BREAK)
+        elif child.tag in ("script", "style"):
+            continue
+        elif child.tag in BLOCK_TAGS:
+            parts.append(LINE_BREAK)
+            _collect_text(child, parts)
+            parts.append(LINE_BREAK)
+        else:
+            _collect_text(child, parts)
+
+def inner_text(node):
+    
+    # Break lines only at LINE_BREAK, trim each line and drop empty ones.
+    parts = []
+    _collect_text(node, parts)
+    lines = []
+    line = []
+    for part in parts + [LINE_BREAK]:
+        if part is LINE_BREAK:
+            lines.append(" ".join("".join(line).split()))
+            line = []
+        else:
+            line.append(part)
+    return "\n".join(line for line in lines if line)
+
+def scrape_state_static(tree, page_url):
+    
+    chambers = []
+    for item in tree.css(CHAMBER_SELECTOR):
+        node = item.css_first(NAME_SELECTOR)
+        name = (inner_text(node) if node is not None else "") or "N/A"
+        
+        node = item.css_first(ADDRESS_SELECTOR)
+        address = (inner_text(node) if node is not None else "") or "N/A"
+        
+        website = None
+        for a in item.css("a"):
+            href = a.attributes.get("href")
+            if href:
+                href = urljoin(page_url, href)
+            # If the href is external (not on BASE_HOST), assume it is the website.
+            if href and href.startswith(("http://", "https://")) and urlsplit(href).netloc != BASE_HOST:
+                website = href
+                break
+
+        chambers.append({
+            "name": name,
+            "address": address,
+            "website": website
+        })
+    return chambers
+
+# Runs in the browser; arguments are BASE_HOST and the chamber, name and
+# address selectors. Text is normalized like inner_text() and the anchors'
+# parsed protocol/hostname give the same external-link rule, so both paths
+# return the same values for the same markup.
+EXTRACT_CHAMBERS_JS = r"""
+const [baseHost, chamberSel, nameSel, addressSel] = arguments;
+const items = (window.__cfc || {})[chamberSel] || document.querySelectorAll(chamberSel);
+// Same normalization as inner_text(): collapse each line, drop empty ones.
+const clean = node => (node?.innerText || '').split('\n')
+    .map(line => line.replace(/\s+/g, ' ').trim()).filter(Boolean).join('\n');
+return [...items].map(el => ({
+    name: clean(el.querySelector(nameSel)) || 'N/A',
+    address: clean(el.querySelector(addressSel)) || 'N/A',
+    website: [...el.querySelectorAll('a')]
+        .find(a => (a.protocol === 'http:' || a.protocol === 'https:') && a.host !== baseHost)?.href || null
+}));
+"""
+
+def scrape_state(cache, state_name, state_url):
    
     print(f"\nScraping state: {state_name}\nURL: {state_url}")
-    driver.get(state_url)
+    key = hashlib.sha1(f"{EXTRACTOR_VERSION}:{state_url}".encode()).hexdigest()
+    chambers = cache.get(key)
+    if chambers is not None:
+        print(f"Using cached data for {state_name}")
+        return chambers
+    
+    chambers = fetch_state(state_name, state_url)
+    # Empty results are usually failures, so don't keep them around.
+    if chambers:
+        cache.set(key, chambers, expire=CACHE_TTL)
+    return chambers
+
+def fetch_state(state_name, state_url):
+    
+    tree = probe_static(state_url)
+    if tree is not None:
+        return scrape_state_static(tree, state_url)
     
-  
+    # A browser or navigation failure only costs this state, not the run.
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".chamber-finder__content"))
-        )
+        driver = get_driver()
+        driver.get(state_url)
     except Exception as e:
-        print(f"Timed out waiting for chamber items on {state_name}: {e}")
+        print(f"Failed to load {state_url} for {state_name}: {e}")
         return []
     
-    
-    time.sleep(2)
+    # Wait until the chamber list stops growing rather than sleeping.
+    try:
+        wait_for_stable(driver, CHAMBER_SELECTOR)
+    except Exception as e:
+        print(f"Timed out waiting for chamber items on {state_name}: {e}")
+        return []
     
     chambers = []
     try:
-       
-        chamber_items = driver.find_elements(By.CSS_SELECTOR, ".chamber-finder__content")
-        for item in chamber_items:
-            try:
-                name = item.find_element(By.TAG_NAME, "h3").text.strip()
-            except Exception:
-                name = "N/A"
-            
-            try:
-                address = item.find_element(By.CSS_SELECTOR, ".chamber-finder__address").text.strip()
-            except Exception:
-                address = "N/A"
-            
-            
-            website = None
-            try:
-                links = item.find_elements(By.TAG_NAME, "a")
-                for a in links:
-                    href = a.get_attribute("href")
-                    # If the href is external (does not contain BASE_URL), assume it is the website.
-                    if href and href.startswith("http") and BASE_URL not in href:
-                        website = href
-                        break
-            except Exception:
-                website = None
-
-            chambers.append({
-                "name": name,
-                "address": address,
-                "website": website
-            })
+        # One round-trip for the whole page instead of several per chamber.
+        chambers = driver.execute_script(
+            EXTRACT_CHAMBERS_JS, BASE_HOST, CHAMBER_SELECTOR, NAME_SELECTOR, ADDRESS_SELECTOR
+        )
     except Exception as e:
         print(f"Error scraping chambers for {state_name}: {e}")
     return chambers
 
-def save_state_data(state_name, chambers):
+def save_state_data(results, filename):
     
-    safe_state_name = sanitize_filename(state_name)
-    output_data = {state_name: chambers}
-    filename = f"{safe_state_name}.json"
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(output_data, f, indent=4)
-    print(f"Saved data for {state_name} in {filename}")
+    # One JSON object per line, written from the calling thread in input order.
+    # The previous file is only replaced once every state has been written.
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as f:
+        for state_name, chambers in results:
+            f.write(orjson.dumps({state_name: chambers}) + b"\n")
+            print(f"Saved data for {state_name}")
+    os.replace(tmp_filename, filename)
+    print(f"Wrote {filename}")
 
-def main():
-    
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    
-    driver = webdriver.Chrome(options=chrome_options)
+def quit_drivers():
     
+    global _service
+    with _drivers_lock:
+        while _drivers:
+            _drivers.pop().quit()
+        if _service is not None:
+            _service.stop()
+            _service = None
+        while _temp_profiles:
+            shutil.rmtree(_temp_profiles.pop(), ignore_errors=True)
+
+def main():
     
-    driver.get(MAIN_PAGE)
-   
-    time.sleep(3)
-    
+    try:
+        run()
+    finally:
+        quit_drivers()
+
+def run():
     
-    state_links = get_state_links(driver)
+    tree = probe_static(MAIN_PAGE, "#chamber-finder-js a")
+    if tree is not None:
+        state_links = get_state_links_static(tree)
+    else:
+        driver = get_driver()
+        driver.get(MAIN_PAGE)
+        
+        try:
+            wait_for_stable(driver, "#chamber-finder-js a")
+        except Exception as e:
+            print("Timed out waiting for state links to settle:", e)
+        
+        state_links = get_state_links(driver)
+        # The workers use their own drivers; don't keep this one idle.
+        release_driver()
     if not state_links:
         print("No state links found. Please verify the page structure.")
-        driver.quit()
         return
     
-    # Create output directory
-    output_dir = "chambers_by_state"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    os.chdir(output_dir)
-    
-    
-    for state_name, state_url in state_links.items():
-        chambers = scrape_state(driver, state_name, state_url)
-        save_state_data(state_name, chambers)
+    # Create output directory; resolved once so nothing depends on the CWD later.
+    output_dir = os.path.abspath("chambers_by_state")
+    os.makedirs(output_dir, exist_ok=True)
     
-    driver.quit()
+    with Cache(CACHE_DIR) as cache:
+        
+        def scrape(item):
+            state_name, state_url = item
+            return state_name, scrape_state(cache, state_name, state_url)
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # map yields in input order and re-raises worker exceptions here.
+            results = executor.map(scrape, state_links.items())
+            save_state_data(results, os.path.join(output_dir, "chambers.jsonl"))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
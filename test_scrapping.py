@@ -0,0 +1,120 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import scrapping
+
+node = shutil.which("node")
+needs_node = pytest.mark.skipif(node is None, reason="node is not installed")
+
+
+def run_js(script, args, prelude=""):
+    # Wrap the script the way WebDriver's execute_script does.
+    source = f"{prelude}\nconsole.log(JSON.stringify(function() {{\n{script}\n}}.apply(null, {json.dumps(args)})));"
+    result = subprocess.run([node, "-e", source], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@needs_node
+@pytest.mark.parametrize("name", ["STABLE_COUNT_JS", "STATE_LINKS_JS", "EXTRACT_CHAMBERS_JS"])
+def test_browser_scripts_parse(name):
+    source = f"(function() {{\n{getattr(scrapping, name)}\n}});"
+    subprocess.run([node, "--check", "-"], input=source, text=True, check=True)
+
+
+# Minimal stand-in for the DOM pieces EXTRACT_CHAMBERS_JS touches.
+FAKE_DOM = """
+var window = {};
+function el(innerText, links) {
+    return {innerText: innerText, querySelectorAll: () => links || []};
+}
+var chamber = {
+    querySelector: sel => sel === 'h3' ? el('  Foo   Chamber ') : null,
+    querySelectorAll: () => [
+        {protocol: 'https:', host: 'www.uschamber.com', href: 'https://www.uschamber.com/x'},
+        {protocol: 'https:', host: 'ext.org', href: 'https://ext.org/'},
+    ],
+};
+var withAddress = {
+    querySelector: sel => sel === 'h3' ? el('') : el('1 St\\n\\n City '),
+    querySelectorAll: () => [],
+};
+var document = {querySelectorAll: () => [chamber, withAddress]};
+"""
+
+
+@needs_node
+def test_extract_chambers_js():
+    args = [scrapping.BASE_HOST, scrapping.CHAMBER_SELECTOR, scrapping.NAME_SELECTOR, scrapping.ADDRESS_SELECTOR]
+    assert run_js(scrapping.EXTRACT_CHAMBERS_JS, args, FAKE_DOM) == [
+        {"name": "Foo Chamber", "address": "N/A", "website": "https://ext.org/"},
+        {"name": "N/A", "address": "1 St\nCity", "website": None},
+    ]
+
+
+STATE_PAGE = """
+<div class="chamber-finder__content">
+  <h3>
+    Foo
+    Chamber
+  </h3>
+  <div class="chamber-finder__address">1 Main St<br>
+    Springfield,   IL</div>
+  <a href="/co/chambers/illinois">Profile</a>
+  <a href="//foo-chamber.org/">Website</a>
+</div>
+<div class="chamber-finder__content">
+  <h3>  </h3>
+  <a href="https://www.uschamber.com/x">Profile</a>
+</div>
+"""
+
+
+def test_scrape_state_static():
+    tree = scrapping.LexborHTMLParser(STATE_PAGE)
+    assert scrapping.scrape_state_static(tree, "https://www.uschamber.com/co/chambers/illinois") == [
+        {"name": "Foo Chamber", "address": "1 Main St\nSpringfield, IL", "website": "https://foo-chamber.org/"},
+        {"name": "N/A", "address": "N/A", "website": None},
+    ]
+
+
+def test_inner_text_block_boundaries():
+    tree = scrapping.LexborHTMLParser("<div id='a'><p>A\n  one</p><p>B</p> <b>tail</b></div>")
+    assert scrapping.inner_text(tree.css_first("#a")) == "A one\nB\ntail"
+
+
+def test_get_state_links_static():
+    tree = scrapping.LexborHTMLParser("""
+    <div id="chamber-finder-js">
+      <a href="/co/chambers/new-york">
+        New
+        York
+      </a>
+      <a href="../co/chambers/ohio">Ohio</a>
+      <a href="/co/chambers">All states</a>
+      <a href="/co/chambers/empty"> </a>
+      <a href="/about">About</a>
+    </div>
+    """)
+    assert scrapping.get_state_links_static(tree) == {
+        "New York": "https://www.uschamber.com/co/chambers/new-york",
+        "Ohio": "https://www.uschamber.com/co/chambers/ohio",
+    }
+
+
+def test_save_state_data_keeps_previous_file_on_failure(tmp_path):
+    filename = tmp_path / "chambers.jsonl"
+    filename.write_bytes(b"previous\n")
+
+    def results():
+        yield "Ohio", []
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        scrapping.save_state_data(results(), str(filename))
+    assert filename.read_bytes() == b"previous\n"
+
+    scrapping.save_state_data([("Ohio", []), ("Utah", [])], str(filename))
+    assert filename.read_bytes() == b'{"Ohio":[]}\n{"Utah":[]}\n'